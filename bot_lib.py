@@ -1,6 +1,6 @@
 import dataclasses
 import itertools
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 
 import game
 
@@ -96,11 +96,12 @@ class State:
         return value
 
 
-def choose_action_with_bot(turn_state: game.TurnState, game_state: game.GameState) -> game.Action:
-    print('')
+def choose_action_with_bot(turn_state: game.TurnState, game_state: game.GameState, verbose: bool = True) -> game.Action:
     dice = turn_state.available_dice
     dice.sort()
-    print(dataclasses.replace(turn_state, available_dice=dice))
+    if verbose:
+        print('')
+        print(dataclasses.replace(turn_state, available_dice=dice))
     board = game.Board(turn_state.available_dice)
 
     possible_actions: List[Tuple[game.Action, int]] = []
@@ -128,7 +129,8 @@ def choose_action_with_bot(turn_state: game.TurnState, game_state: game.GameStat
 
         possible_actions.append((game.Actions.keep_dice(keep_set_dice), possible_state.get_value()))
 
-    print(list(map(lambda tup: (str(tup[0]), tup[1]), possible_actions)))
+    if verbose:
+        print(list(map(lambda tup: (str(tup[0]), tup[1]), possible_actions)))
 
     best = possible_actions[0]
     for possible_action in possible_actions:
@@ -158,3 +160,52 @@ def _should_not_consider_rerolling_turn(turn_state: game.TurnState, game_state:
 
     score_to_beat = max(map(lambda opponent: opponent.score, game_state.opponents_states))
     return game_state.current_players_state.score + turn_state.turn_score > score_to_beat
+
+
+@dataclasses.dataclass(frozen=True)
+class Strategy:
+    """A tunable rule-based policy. Pass `strategy.choose_action` to a game.Player.
+
+    bank_thresholds: Bank once the turn score reaches bank_thresholds[n - 1] with n dice left to roll.
+    extra_keep_min_score: After the mandatory keep, also keep any other set worth at least this much.
+    chase_margin: Once an opponent has reached score_to_win, keep rolling until more than this far ahead of them.
+    hail_mary_deficit: Ignore bank thresholds while trailing the leader by at least this much. None disables it.
+    """
+    bank_thresholds: Tuple[int, ...] = (300, 300, 350, 400, 500, 600)
+    extra_keep_min_score: int = 200
+    chase_margin: int = 0
+    hail_mary_deficit: Optional[int] = None
+
+    def __post_init__(self) -> None:
+        if len(self.bank_thresholds) != game.Board.MAX_DICE:
+            raise ValueError(f'Expected {game.Board.MAX_DICE} bank thresholds: {self.bank_thresholds}')
+
+    def choose_action(self, turn_state: game.TurnState, game_state: game.GameState) -> game.Action:
+        board = game.Board(turn_state.available_dice)
+        keep_sets = board.get_available_keep_sets()
+        keep_sets.sort(key=lambda dice: game.get_keep_set_or_die(dice).score, reverse=True)
+
+        # Right after a roll something has to be kept.
+        if not turn_state.can_reroll:
+            return game.Actions.keep_dice(keep_sets[0])
+
+        if keep_sets and game.get_keep_set_or_die(keep_sets[0]).score >= self.extra_keep_min_score:
+            return game.Actions.keep_dice(keep_sets[0])
+
+        if self._should_bank(turn_state, game_state):
+            return game.Actions.end_turn()
+
+        return game.Actions.reroll()
+
+    def _should_bank(self, turn_state: game.TurnState, game_state: game.GameState) -> bool:
+        total_score = game_state.current_players_state.score + turn_state.turn_score
+        score_to_beat = max(map(lambda opponent: opponent.score, game_state.opponents_states), default=None)
+
+        if score_to_beat is not None and game_state.score_to_win_has_been_reached:
+            return total_score > score_to_beat + self.chase_margin
+
+        if (score_to_beat is not None and self.hail_mary_deficit is not None
+                and score_to_beat - total_score >= self.hail_mary_deficit):
+            return False
+
+        return turn_state.turn_score >= self.bank_thresholds[len(turn_state.available_dice) - 1]
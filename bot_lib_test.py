@@ -1,6 +1,7 @@
 import unittest
 
 import bot_lib
+import game
 
 
 class StateTest(unittest.TestCase):
@@ -33,5 +34,52 @@ class StateTest(unittest.TestCase):
             can_end=False,
             ).get_value(), 5)
 
+class StrategyTest(unittest.TestCase):
+    def _game_state(self, score, opponent_score, score_to_win_has_been_reached=False):
+        return game.GameState(
+            score_to_win_has_been_reached=score_to_win_has_been_reached,
+            current_players_state=game.PlayerState(score=score),
+            opponents_states=[game.PlayerState(score=opponent_score)],
+        )
+
+    def test_invalid_thresholds(self):
+        with self.assertRaises(ValueError):
+            bot_lib.Strategy(bank_thresholds=(300,))
+
+    def test_keeps_best_set_after_roll(self):
+        action = bot_lib.Strategy().choose_action(
+            game.TurnState(turn_score=0, can_reroll=False, available_dice=[1,2,2,2,3,5]),
+            self._game_state(0, 0),
+        )
+        self.assertEqual(str(action), 'KeepDice[2, 2, 2]')
+
+    def test_bank_threshold(self):
+        strategy = bot_lib.Strategy(bank_thresholds=(300, 300, 300, 400, 500, 600), extra_keep_min_score=1000)
+        turn_state = game.TurnState(turn_score=350, can_reroll=True, available_dice=[1,2,3])
+
+        self.assertIsInstance(strategy.choose_action(turn_state, self._game_state(0, 0)), game.EndTurn)
+        turn_state = game.TurnState(turn_score=350, can_reroll=True, available_dice=[1,2,3,4])
+        self.assertIsInstance(strategy.choose_action(turn_state, self._game_state(0, 0)), game.Reroll)
+
+    def test_chase_margin(self):
+        turn_state = game.TurnState(turn_score=600, can_reroll=True, available_dice=[2,3])
+        game_state = self._game_state(4500, 5050, score_to_win_has_been_reached=True)
+
+        self.assertIsInstance(bot_lib.Strategy().choose_action(turn_state, game_state), game.EndTurn)
+        self.assertIsInstance(bot_lib.Strategy(chase_margin=100).choose_action(turn_state, game_state), game.Reroll)
+
+        # Ties go to the player who got there first, so banking level with the leader loses.
+        turn_state = game.TurnState(turn_score=300, can_reroll=True, available_dice=[2,3])
+        game_state = self._game_state(700, 1000, score_to_win_has_been_reached=True)
+        self.assertIsInstance(bot_lib.Strategy().choose_action(turn_state, game_state), game.Reroll)
+
+    def test_hail_mary(self):
+        turn_state = game.TurnState(turn_score=600, can_reroll=True, available_dice=[2,3])
+
+        self.assertIsInstance(bot_lib.Strategy().choose_action(turn_state, self._game_state(0, 3000)), game.EndTurn)
+        strategy = bot_lib.Strategy(hail_mary_deficit=2000)
+        self.assertIsInstance(strategy.choose_action(turn_state, self._game_state(0, 3000)), game.Reroll)
+        self.assertIsInstance(strategy.choose_action(turn_state, self._game_state(2000, 3000)), game.EndTurn)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
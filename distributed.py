@@ -0,0 +1,435 @@
+"""Runs a simulation across many worker processes, possibly on other machines.
+
+The coordinator splits a job's games into fixed tasks (ranges of game
+indices) and hands them out over TCP. Each worker replies with a compact
+partial aggregate. A task held by a worker that disconnects or stops
+responding goes back on the queue for another worker. Every game is seeded
+from (master_seed, game index) and partials are merged in task order, so the
+result only depends on the job, not on how many workers ran it or which
+worker ran what.
+
+Messages are JSON objects, one per line:
+    coordinator -> worker: {"type": "job", "job": {...}} once on connect
+    worker -> coordinator: {"type": "ready"}
+    coordinator -> worker: {"type": "task", "task_id": n, "first_game": n, "num_games": n}
+    worker -> coordinator: {"type": "result", "task_id": n, "result": {...}}
+    coordinator -> worker: {"type": "done"}
+
+Usage, with each worker on any host that can reach the coordinator:
+    python distributed.py coordinator --port 7777 --games 1000000 --seed 1
+    python distributed.py worker --host <coordinator host> --port 7777
+
+The coordinator's --strategies option takes the players as a JSON list of
+bot_lib.Strategy fields, e.g. '[{}, {"hail_mary_deficit": 2000}]'. Fields
+that are left out keep their defaults.
+"""
+import argparse
+from collections import deque
+import dataclasses
+import json
+import multiprocessing
+import socket
+import socketserver
+import threading
+import time
+from typing import Any, BinaryIO, Callable, Dict, Optional, Tuple
+
+import bot_lib
+import game
+import simulation
+
+
+def _strategy_from_dict(data: Dict[str, Any]) -> bot_lib.Strategy:
+    if 'bank_thresholds' in data:
+        data = dict(data, bank_thresholds=tuple(data['bank_thresholds']))
+
+    return bot_lib.Strategy(**data)
+
+
+@dataclasses.dataclass(frozen=True)
+class SimulationJob:
+    """Full games between `strategies`, with seats rotating every game."""
+    strategies: Tuple[bot_lib.Strategy, ...]
+    score_to_win: int
+    master_seed: int
+    num_games: int
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dataclasses.asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'SimulationJob':
+        return cls(
+            strategies=tuple(map(_strategy_from_dict, data['strategies'])),
+            score_to_win=data['score_to_win'],
+            master_seed=data['master_seed'],
+            num_games=data['num_games'],
+        )
+
+
+class JobResult:
+    """Winning scores and the number of wins for each strategy in a job."""
+
+    def __init__(self, num_strategies: int, scores: Optional[simulation.ScoreAggregate] = None) -> None:
+        self.scores = scores if scores is not None else simulation.ScoreAggregate()
+        self.wins = [0] * num_strategies
+
+    def merge(self, other: 'JobResult') -> None:
+        if len(self.wins) != len(other.wins):
+            raise ValueError(f'Cannot merge results for {len(other.wins)} strategies into {len(self.wins)}')
+
+        self.scores.merge(other.scores)
+        self.wins = [mine + theirs for mine, theirs in zip(self.wins, other.wins)]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'scores': self.scores.to_dict(), 'wins': self.wins.copy()}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'JobResult':
+        result = cls(len(data['wins']), simulation.ScoreAggregate.from_dict(data['scores']))
+        result.wins = list(data['wins'])
+        return result
+
+
+def play_games(job: SimulationJob, first_game: int, num_games: int) -> JobResult:
+    result = JobResult(len(job.strategies))
+
+    for index in range(first_game, first_game + num_games):
+        players = [
+            game.Player(f'player-{strategy_index}', 0, strategy.choose_action)
+            for strategy_index, strategy in enumerate(job.strategies)
+        ]
+
+        outcome = simulation.play_seeded_game(job.master_seed, index, players, job.score_to_win)
+        result.scores.add(outcome.winner.score)
+        result.wins[players.index(outcome.winner)] += 1
+
+    return result
+
+
+def _send(wfile: BinaryIO, message: Dict[str, Any]) -> None:
+    wfile.write(json.dumps(message).encode() + b'\n')
+    wfile.flush()
+
+def _receive(rfile: BinaryIO) -> Optional[Dict[str, Any]]:
+    line = rfile.readline()
+    if not line:
+        return None
+
+    return json.loads(line)
+
+
+class _WorkerHandler(socketserver.StreamRequestHandler):
+    server: '_CoordinatorServer'
+
+    def handle(self) -> None:
+        coordinator = self.server.coordinator
+        self.request.settimeout(coordinator.task_timeout)
+        task_id = None
+
+        try:
+            _send(self.wfile, {'type': 'job', 'job': coordinator.job.to_dict()})
+
+            while True:
+                message = _receive(self.rfile)
+                if message is None:
+                    break
+
+                if message['type'] == 'result':
+                    if message['task_id'] != task_id:
+                        raise ValueError(f'Result for unassigned task {message["task_id"]}')
+                    result = JobResult.from_dict(message['result'])
+                    coordinator._check_result(task_id, result)
+                    coordinator._complete_task(task_id, result)
+                    task_id = None
+                elif message['type'] != 'ready':
+                    raise ValueError(f'Unexpected message: {message["type"]}')
+                elif task_id is not None:
+                    raise ValueError(f'Worker is ready while still holding task {task_id}')
+
+                task_id = coordinator._next_task()
+                if task_id is None:
+                    _send(self.wfile, {'type': 'done'})
+                    break
+
+                first_game, num_games = coordinator._task_games(task_id)
+                _send(self.wfile, {
+                    'type': 'task',
+                    'task_id': task_id,
+                    'first_game': first_game,
+                    'num_games': num_games,
+                })
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            coordinator._print(f'Lost worker {self.client_address}: {e!r}')
+        finally:
+            if task_id is not None:
+                coordinator._requeue_task(task_id)
+
+
+class _CoordinatorServer(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], coordinator: 'Coordinator') -> None:
+        super().__init__(address, _WorkerHandler)
+        self.coordinator = coordinator
+
+
+class Coordinator:
+    """Hands out a job's games to workers in tasks of `chunk_size` games and merges the results.
+
+    A worker that has not returned its task within `task_timeout` seconds is
+    dropped and the task is given to another worker.
+    """
+
+    def __init__(
+        self,
+        job: SimulationJob,
+        host: str = '0.0.0.0',
+        port: int = 0,
+        chunk_size: int = 1000,
+        task_timeout: float = 600.0,
+        verbose: bool = True,
+    ) -> None:
+        self.job = job
+        self.task_timeout = task_timeout
+        self._chunk_size = chunk_size
+        self._verbose = verbose
+
+        self._num_tasks = -(-job.num_games // chunk_size)
+        self._pending = deque(range(self._num_tasks))
+        self._results: Dict[int, JobResult] = {}
+        self._condition = threading.Condition()
+        self._closed = False
+
+        # Bind now so the address is known before any worker is started.
+        self._server = _CoordinatorServer((host, port), self)
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        return self._server.server_address[:2]
+
+    def run(self, timeout: Optional[float] = None, workers_alive: Optional[Callable[[], bool]] = None) -> JobResult:
+        """Serves tasks until every game has been played.
+
+        Raises TimeoutError if that takes longer than `timeout` seconds, and
+        RuntimeError if `workers_alive` reports that no workers are left.
+        """
+        server_thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        server_thread.start()
+        self._print(f'Coordinating {self.job.num_games} games in {self._num_tasks} tasks on {self.address}')
+        deadline = time.monotonic() + timeout if timeout is not None else None
+
+        try:
+            with self._condition:
+                while len(self._results) < self._num_tasks:
+                    if deadline is not None and time.monotonic() > deadline:
+                        raise TimeoutError(f'Only {len(self._results)} of {self._num_tasks} tasks done after {timeout}s')
+                    if workers_alive is not None and not workers_alive():
+                        raise RuntimeError(f'All workers exited with {len(self._results)} of {self._num_tasks} tasks done')
+                    self._condition.wait(timeout=1.0)
+        finally:
+            # Wake any handlers waiting for a task so they tell their workers to stop.
+            with self._condition:
+                self._closed = True
+                self._condition.notify_all()
+            self._server.shutdown()
+            self._server.server_close()
+
+        # Merge in task order so floating point results are reproducible.
+        result = JobResult(len(self.job.strategies))
+        for task_id in range(self._num_tasks):
+            result.merge(self._results[task_id])
+
+        return result
+
+    def _task_games(self, task_id: int) -> Tuple[int, int]:
+        first_game = task_id * self._chunk_size
+        return first_game, min(self._chunk_size, self.job.num_games - first_game)
+
+    def _next_task(self) -> Optional[int]:
+        """Blocks until there is a task to hand out, or returns None once every task is done or run() has ended."""
+        with self._condition:
+            while not self._pending or self._closed:
+                if self._closed or len(self._results) == self._num_tasks:
+                    return None
+                self._condition.wait()
+
+            return self._pending.popleft()
+
+    def _check_result(self, task_id: int, result: JobResult) -> None:
+        """Rejects a result that cannot have come from playing the given task."""
+        _, num_games = self._task_games(task_id)
+        if len(result.wins) != len(self.job.strategies):
+            raise ValueError(f'Task {task_id} result has wins for {len(result.wins)} strategies')
+        if sum(result.wins) != num_games or result.scores.stats.count != num_games:
+            raise ValueError(f'Task {task_id} result does not cover its {num_games} games')
+
+    def _complete_task(self, task_id: int, result: JobResult) -> None:
+        with self._condition:
+            if task_id not in self._results:
+                self._results[task_id] = result
+                self._print(f'[{len(self._results)}/{self._num_tasks}] tasks {result.scores.summary()}')
+            self._condition.notify_all()
+
+    def _requeue_task(self, task_id: int) -> None:
+        with self._condition:
+            if task_id not in self._results:
+                self._pending.appendleft(task_id)
+                self._print(f'Requeued task {task_id}')
+            self._condition.notify_all()
+
+    def _print(self, *args: object) -> None:
+        if self._verbose:
+            print(*args)
+
+
+def _connect(host: str, port: int, connect_timeout: float) -> socket.socket:
+    deadline = time.monotonic() + connect_timeout
+    while True:
+        try:
+            return socket.create_connection((host, port))
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.5)
+
+
+def _enable_keepalive(connection: socket.socket) -> None:
+    """Lets a worker notice a coordinator that has vanished without closing the connection."""
+    connection.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+    if hasattr(socket, 'TCP_KEEPIDLE'):
+        connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, 60)
+        connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, 10)
+        connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPCNT, 6)
+
+
+def _work(connection: socket.socket) -> bool:
+    """Plays tasks from one connection. Returns True once the coordinator says the job is done."""
+    _enable_keepalive(connection)
+    with connection, connection.makefile('rb') as rfile, connection.makefile('wb') as wfile:
+        message = _receive(rfile)
+        if message is None:
+            return False
+        job = SimulationJob.from_dict(message['job'])
+
+        _send(wfile, {'type': 'ready'})
+        while True:
+            message = _receive(rfile)
+            if message is None:
+                return False
+            if message['type'] == 'done':
+                return True
+
+            result = play_games(job, message['first_game'], message['num_games'])
+            _send(wfile, {'type': 'result', 'task_id': message['task_id'], 'result': result.to_dict()})
+
+
+def run_worker(host: str, port: int, connect_timeout: float = 60.0) -> None:
+    """Connects to a coordinator and plays the games it hands out until the job is done.
+
+    If the connection is lost, for example because the coordinator dropped this
+    worker for being too slow, it reconnects and carries on with a new task.
+    """
+    while True:
+        connection = _connect(host, port, connect_timeout)
+        try:
+            if _work(connection):
+                return
+        except OSError as e:
+            print(f'Lost connection to coordinator: {e!r}')
+
+
+def run_local(
+    job: SimulationJob,
+    num_workers: int,
+    chunk_size: int = 1000,
+    timeout: Optional[float] = None,
+    verbose: bool = True,
+) -> JobResult:
+    """Runs a job with a coordinator and `num_workers` worker processes on this machine.
+
+    Raises RuntimeError if every worker process exits before the job is done.
+    """
+    coordinator = Coordinator(job, host='127.0.0.1', chunk_size=chunk_size, verbose=verbose)
+    host, port = coordinator.address
+    workers = [multiprocessing.Process(target=run_worker, args=(host, port)) for _ in range(num_workers)]
+
+    for worker in workers:
+        worker.start()
+    try:
+        return coordinator.run(
+            timeout=timeout,
+            workers_alive=lambda: any(worker.is_alive() for worker in workers),
+        )
+    finally:
+        for worker in workers:
+            worker.join(timeout=10)
+            if worker.is_alive():
+                worker.terminate()
+
+
+def _print_result(job: SimulationJob, result: JobResult) -> None:
+    print(result.scores.summary())
+    for strategy, wins in zip(job.strategies, result.wins):
+        print(f'{wins / job.num_games:.4f} win rate: {strategy}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Distributed Around the Bend simulation.')
+    subparsers = parser.add_subparsers(dest='mode', required=True)
+
+    coordinator_parser = subparsers.add_parser('coordinator')
+    coordinator_parser.add_argument('--host', default='0.0.0.0')
+    coordinator_parser.add_argument('--port', type=int, default=7777)
+    coordinator_parser.add_argument('--games', type=int, default=100_000)
+    coordinator_parser.add_argument('--seed', type=int, default=642281)
+    coordinator_parser.add_argument('--score-to-win', type=int, default=5000)
+    coordinator_parser.add_argument('--chunk-size', type=int, default=1000)
+    coordinator_parser.add_argument('--local-workers', type=int, default=0,
+                                    help='Also start this many workers on this machine.')
+    coordinator_parser.add_argument('--timeout', type=float, default=None,
+                                    help='Give up if the job is not done after this many seconds.')
+    coordinator_parser.add_argument('--strategies', type=json.loads, default=[{}, {'hail_mary_deficit': 2000}],
+                                    help='JSON list of bot_lib.Strategy fields, one object per player.')
+
+    worker_parser = subparsers.add_parser('worker')
+    worker_parser.add_argument('--host', default='127.0.0.1')
+    worker_parser.add_argument('--port', type=int, default=7777)
+
+    args = parser.parse_args()
+
+    if args.mode == 'worker':
+        run_worker(args.host, args.port)
+        return
+
+    job = SimulationJob(
+        strategies=tuple(map(_strategy_from_dict, args.strategies)),
+        score_to_win=args.score_to_win,
+        master_seed=args.seed,
+        num_games=args.games,
+    )
+    coordinator = Coordinator(job, host=args.host, port=args.port, chunk_size=args.chunk_size)
+    host, port = coordinator.address
+    # Local workers can reach a coordinator listening on all interfaces through loopback.
+    local_host = '127.0.0.1' if host == '0.0.0.0' else host
+    workers = [
+        multiprocessing.Process(target=run_worker, args=(local_host, port))
+        for _ in range(args.local_workers)
+    ]
+    for worker in workers:
+        worker.start()
+
+    try:
+        result = coordinator.run(timeout=args.timeout)
+    finally:
+        for worker in workers:
+            worker.join(timeout=10)
+            if worker.is_alive():
+                worker.terminate()
+
+    _print_result(job, result)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,207 @@
+import json
+import socket
+import threading
+import unittest
+
+import bot_lib
+import distributed
+
+
+JOB = distributed.SimulationJob(
+    strategies=(bot_lib.Strategy(), bot_lib.Strategy(bank_thresholds=(200, 200, 200, 200, 200, 200))),
+    score_to_win=1000,
+    master_seed=7,
+    num_games=40,
+)
+
+
+class SimulationJobTest(unittest.TestCase):
+    def test_round_trip(self):
+        self.assertEqual(distributed.SimulationJob.from_dict(json.loads(json.dumps(JOB.to_dict()))), JOB)
+
+    def test_from_dict_defaults_missing_fields(self):
+        job = distributed.SimulationJob.from_dict(
+            dict(JOB.to_dict(), strategies=[{}, {'hail_mary_deficit': 2000}]))
+
+        self.assertEqual(job.strategies, (bot_lib.Strategy(), bot_lib.Strategy(hail_mary_deficit=2000)))
+
+    def test_play_games(self):
+        result = distributed.play_games(JOB, 0, 10)
+
+        self.assertEqual(sum(result.wins), 10)
+        self.assertEqual(result.scores.stats.count, 10)
+        self.assertEqual(result.to_dict(), distributed.play_games(JOB, 0, 10).to_dict())
+
+    def test_merge_matches_single_run(self):
+        merged = distributed.play_games(JOB, 0, 6)
+        merged.merge(distributed.play_games(JOB, 6, 4))
+        single = distributed.play_games(JOB, 0, 10)
+
+        self.assertEqual(merged.wins, single.wins)
+        self.assertEqual(merged.scores.histogram.to_dict(), single.scores.histogram.to_dict())
+        self.assertAlmostEqual(merged.scores.stats.mean, single.scores.stats.mean)
+
+    def test_merge_different_strategy_counts(self):
+        with self.assertRaises(ValueError):
+            distributed.JobResult(2).merge(distributed.JobResult(3))
+
+
+class CoordinatorTest(unittest.TestCase):
+    def test_deterministic_across_worker_counts(self):
+        one_worker = distributed.run_local(JOB, num_workers=1, chunk_size=7, verbose=False)
+        three_workers = distributed.run_local(JOB, num_workers=3, chunk_size=7, verbose=False)
+
+        self.assertEqual(sum(one_worker.wins), JOB.num_games)
+        self.assertEqual(one_worker.to_dict(), three_workers.to_dict())
+
+    def test_lost_worker_task_is_reassigned(self):
+        expected = distributed.run_local(JOB, num_workers=1, chunk_size=10, verbose=False)
+
+        coordinator = distributed.Coordinator(JOB, host='127.0.0.1', chunk_size=10, verbose=False)
+        host, port = coordinator.address
+        result = {}
+        coordinator_thread = threading.Thread(target=lambda: result.update(job_result=coordinator.run()))
+        coordinator_thread.start()
+
+        # Take a task and then disconnect without returning it.
+        with socket.create_connection((host, port)) as connection:
+            rfile, wfile = connection.makefile('rb'), connection.makefile('wb')
+            distributed._receive(rfile)
+            distributed._send(wfile, {'type': 'ready'})
+            self.assertEqual(distributed._receive(rfile)['task_id'], 0)
+            rfile.close()
+            wfile.close()
+
+        distributed.run_worker(host, port)
+        coordinator_thread.join(timeout=60)
+
+        self.assertEqual(result['job_result'].to_dict(), expected.to_dict())
+
+    def test_ready_while_holding_task_requeues_it(self):
+        expected = distributed.run_local(JOB, num_workers=1, chunk_size=10, verbose=False)
+
+        coordinator = distributed.Coordinator(JOB, host='127.0.0.1', chunk_size=10, verbose=False)
+        host, port = coordinator.address
+        result = {}
+        coordinator_thread = threading.Thread(target=lambda: result.update(job_result=coordinator.run(timeout=60)))
+        coordinator_thread.start()
+
+        with socket.create_connection((host, port)) as connection:
+            rfile, wfile = connection.makefile('rb'), connection.makefile('wb')
+            distributed._receive(rfile)
+            distributed._send(wfile, {'type': 'ready'})
+            self.assertEqual(distributed._receive(rfile)['task_id'], 0)
+            distributed._send(wfile, {'type': 'ready'})
+            # The coordinator treats this as a protocol error and drops the connection.
+            self.assertIsNone(distributed._receive(rfile))
+            rfile.close()
+            wfile.close()
+
+        distributed.run_worker(host, port)
+        coordinator_thread.join(timeout=60)
+
+        self.assertEqual(result['job_result'].to_dict(), expected.to_dict())
+
+    def test_bad_result_is_requeued(self):
+        expected = distributed.run_local(JOB, num_workers=1, chunk_size=10, verbose=False)
+
+        coordinator = distributed.Coordinator(JOB, host='127.0.0.1', chunk_size=10, verbose=False)
+        host, port = coordinator.address
+        result = {}
+        coordinator_thread = threading.Thread(target=lambda: result.update(job_result=coordinator.run(timeout=60)))
+        coordinator_thread.start()
+
+        with socket.create_connection((host, port)) as connection:
+            rfile, wfile = connection.makefile('rb'), connection.makefile('wb')
+            distributed._receive(rfile)
+            distributed._send(wfile, {'type': 'ready'})
+            task = distributed._receive(rfile)
+            bad_result = distributed.play_games(JOB, task['first_game'], task['num_games'])
+            bad_result.wins.append(0)
+            distributed._send(wfile, {'type': 'result', 'task_id': task['task_id'], 'result': bad_result.to_dict()})
+            self.assertIsNone(distributed._receive(rfile))
+            rfile.close()
+            wfile.close()
+
+        distributed.run_worker(host, port)
+        coordinator_thread.join(timeout=60)
+
+        self.assertEqual(result['job_result'].to_dict(), expected.to_dict())
+
+    def test_waiting_workers_are_released_when_run_fails(self):
+        # A single task, so the second worker has to wait for the first.
+        coordinator = distributed.Coordinator(JOB, host='127.0.0.1', chunk_size=JOB.num_games, verbose=False)
+        host, port = coordinator.address
+        errors = []
+        def run():
+            try:
+                coordinator.run(timeout=1)
+            except TimeoutError as e:
+                errors.append(e)
+        coordinator_thread = threading.Thread(target=run)
+        coordinator_thread.start()
+
+        with socket.create_connection((host, port)) as holder, socket.create_connection((host, port)) as waiter:
+            holder_rfile, holder_wfile = holder.makefile('rb'), holder.makefile('wb')
+            distributed._receive(holder_rfile)
+            distributed._send(holder_wfile, {'type': 'ready'})
+            self.assertEqual(distributed._receive(holder_rfile)['task_id'], 0)
+
+            waiter.settimeout(10)
+            waiter_rfile, waiter_wfile = waiter.makefile('rb'), waiter.makefile('wb')
+            distributed._receive(waiter_rfile)
+            distributed._send(waiter_wfile, {'type': 'ready'})
+            self.assertEqual(distributed._receive(waiter_rfile), {'type': 'done'})
+
+            for f in (holder_rfile, holder_wfile, waiter_rfile, waiter_wfile):
+                f.close()
+
+        coordinator_thread.join(timeout=10)
+        self.assertEqual(len(errors), 1)
+
+    def test_run_local_raises_when_workers_die(self):
+        # With no strategies every game fails, so every worker process crashes.
+        job = distributed.SimulationJob(strategies=(), score_to_win=1000, master_seed=7, num_games=10)
+
+        with self.assertRaises(RuntimeError):
+            distributed.run_local(job, num_workers=2, chunk_size=5, timeout=60, verbose=False)
+
+    def test_coordinator_timeout(self):
+        coordinator = distributed.Coordinator(JOB, host='127.0.0.1', verbose=False)
+
+        with self.assertRaises(TimeoutError):
+            coordinator.run(timeout=0.1)
+
+
+class RunWorkerTest(unittest.TestCase):
+    def test_reconnects_after_lost_connection(self):
+        server = socket.create_server(('127.0.0.1', 0))
+        host, port = server.getsockname()
+        connections = []
+
+        def serve():
+            with server:
+                # Hand out a task, then drop the worker before it can reply.
+                connection, _ = server.accept()
+                connections.append(connection)
+                with connection, connection.makefile('rb') as rfile, connection.makefile('wb') as wfile:
+                    distributed._send(wfile, {'type': 'job', 'job': JOB.to_dict()})
+                    distributed._receive(rfile)
+                    distributed._send(wfile, {'type': 'task', 'task_id': 0, 'first_game': 0, 'num_games': 1})
+
+                connection, _ = server.accept()
+                connections.append(connection)
+                with connection, connection.makefile('rb') as rfile, connection.makefile('wb') as wfile:
+                    distributed._send(wfile, {'type': 'job', 'job': JOB.to_dict()})
+                    distributed._receive(rfile)
+                    distributed._send(wfile, {'type': 'done'})
+
+        server_thread = threading.Thread(target=serve)
+        server_thread.start()
+        distributed.run_worker(host, port, connect_timeout=5)
+        server_thread.join(timeout=10)
+
+        self.assertEqual(len(connections), 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -214,13 +214,14 @@ class Player:
 
 
 class GameEngine:
-    def __init__(self, players: List[Player], board: 'Board', score_to_win: int) -> None:
+    def __init__(self, players: List[Player], board: 'Board', score_to_win: int, verbose: bool = True) -> None:
         self._players = players
         self._board = board
         self._score_to_win = score_to_win
+        self._verbose = verbose
 
     def play(self) -> PlayOutcome:
-        print(f'Starting game to {self._score_to_win}')
+        self._print(f'Starting game to {self._score_to_win}')
 
         for player in self._players:
             player.score = 0
@@ -231,10 +232,10 @@ class GameEngine:
             self._print_scoreboard()
             self._board.reset()
             current_player = turn_queue.popleft()
-            print(f'It\'s {current_player.name}\'s ({current_player.score}) turn!')
+            self._print(f'It\'s {current_player.name}\'s ({current_player.score}) turn!')
 
             turn_outcome = self._take_turn(current_player, self._board)
-            print(turn_outcome)
+            self._print(turn_outcome)
 
             current_player.score += turn_outcome.score
             if turn_outcome.kept_all_dice:
@@ -249,9 +250,9 @@ class GameEngine:
             players=self._players,
         )
 
-        print('')
+        self._print('')
         self._print_scoreboard()
-        print(f'{outcome.winner.name} wins!')
+        self._print(f'{outcome.winner.name} wins!')
 
         return outcome
 
@@ -270,19 +271,19 @@ class GameEngine:
 
         while True:
             if isinstance(last_action, EndTurn):
-                print('Ended manually')
+                self._print('Ended manually')
                 return TurnOutcome(get_score(board.get_kept_dice()), False)
 
             if len(board.get_available_dice()) == 0:
-                print('Around the bend')
+                self._print('Around the bend')
                 return TurnOutcome(get_score(board.get_kept_dice()), True)
 
             if not self._player_can_take_action(self._board, turn_state):
-                print('Cannot act')
+                self._print('Cannot act')
                 return TurnOutcome(0, False)
 
             action = current_player.choose_action(turn_state, game_state)
-            print(f'Performing action {action}')
+            self._print(f'Performing action {action}')
             turn_state = action.perform_action(turn_state, board)
             game_state = self._calculate_game_state(current_player)
 
@@ -309,13 +310,17 @@ class GameEngine:
         for player in self._players:
             player.score = 0
 
+    def _print(self, *args: object) -> None:
+        if self._verbose:
+            print(*args)
+
     def _print_scoreboard(self) -> None:
-        print('')
-        print('***** Scores *****')
+        self._print('')
+        self._print('***** Scores *****')
         for player in self._players:
-            print(f'{player.name} - {player.score}')
-        print('******************')
-        print('')
+            self._print(f'{player.name} - {player.score}')
+        self._print('******************')
+        self._print('')
 
 
 class Board:
@@ -0,0 +1,411 @@
+import hashlib
+import json
+import math
+import os
+import random
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+import game
+
+
+class RunningStats:
+    """Streaming mean and variance using Welford's algorithm."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def merge(self, other: 'RunningStats') -> None:
+        """Combines another set of stats into this one (Chan et al.)."""
+        if other.count == 0:
+            return
+        if self.count == 0:
+            self.count, self.mean, self.m2 = other.count, other.mean, other.m2
+            self.min, self.max = other.min, other.max
+            return
+
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    @property
+    def variance(self) -> float:
+        """Sample variance."""
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def stddev(self) -> float:
+        return math.sqrt(self.variance)
+
+    @property
+    def standard_error(self) -> float:
+        return self.stddev / math.sqrt(self.count) if self.count > 0 else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'count': self.count, 'mean': self.mean, 'm2': self.m2, 'min': self.min, 'max': self.max}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'RunningStats':
+        stats = cls()
+        stats.count = data['count']
+        stats.mean = data['mean']
+        stats.m2 = data['m2']
+        stats.min = data['min']
+        stats.max = data['max']
+        return stats
+
+
+class Histogram:
+    """Fixed-width bins over [lower, upper), plus underflow and overflow counts."""
+
+    def __init__(self, lower: float, upper: float, bin_width: float) -> None:
+        if bin_width <= 0 or upper <= lower:
+            raise ValueError(f'Invalid histogram range: lower={lower} upper={upper} bin_width={bin_width}')
+
+        self.lower = lower
+        self.upper = upper
+        self.bin_width = bin_width
+        self.bins = [0] * math.ceil((upper - lower) / bin_width)
+        self.underflow = 0
+        self.overflow = 0
+
+    def add(self, value: float) -> None:
+        if value < self.lower:
+            self.underflow += 1
+        elif value >= self.upper:
+            self.overflow += 1
+        else:
+            self.bins[int((value - self.lower) // self.bin_width)] += 1
+
+    def merge(self, other: 'Histogram') -> None:
+        if (self.lower, self.upper, self.bin_width) != (other.lower, other.upper, other.bin_width):
+            raise ValueError('Cannot merge histograms with different bins')
+
+        self.bins = [mine + theirs for mine, theirs in zip(self.bins, other.bins)]
+        self.underflow += other.underflow
+        self.overflow += other.overflow
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'lower': self.lower,
+            'upper': self.upper,
+            'bin_width': self.bin_width,
+            'bins': self.bins.copy(),
+            'underflow': self.underflow,
+            'overflow': self.overflow,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Histogram':
+        histogram = cls(data['lower'], data['upper'], data['bin_width'])
+        histogram.bins = list(data['bins'])
+        histogram.underflow = data['underflow']
+        histogram.overflow = data['overflow']
+        return histogram
+
+
+class QuantileSketch:
+    """Mergeable quantile sketch with bounded relative error (DDSketch style).
+
+    Values are counted in logarithmically sized buckets, so any quantile is
+    returned within `relative_accuracy` of the true value while memory only
+    grows with the log of the value range.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01) -> None:
+        if not 0 < relative_accuracy < 1:
+            raise ValueError(f'relative_accuracy must be in (0, 1): {relative_accuracy}')
+
+        self.relative_accuracy = relative_accuracy
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self.count = 0
+        self.zero_count = 0
+        self.positive: Dict[int, int] = {}
+        self.negative: Dict[int, int] = {}
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        if value > 0:
+            index = self._index(value)
+            self.positive[index] = self.positive.get(index, 0) + 1
+        elif value < 0:
+            index = self._index(-value)
+            self.negative[index] = self.negative.get(index, 0) + 1
+        else:
+            self.zero_count += 1
+
+    def merge(self, other: 'QuantileSketch') -> None:
+        if self.relative_accuracy != other.relative_accuracy:
+            raise ValueError('Cannot merge sketches with different accuracies')
+
+        self.count += other.count
+        self.zero_count += other.zero_count
+        for index, count in other.positive.items():
+            self.positive[index] = self.positive.get(index, 0) + count
+        for index, count in other.negative.items():
+            self.negative[index] = self.negative.get(index, 0) + count
+
+    def quantile(self, q: float) -> Optional[float]:
+        if not 0 <= q <= 1:
+            raise ValueError(f'Quantile must be in [0, 1]: {q}')
+        if self.count == 0:
+            return None
+
+        rank = q * (self.count - 1)
+        seen = 0
+        for index in sorted(self.negative, reverse=True):
+            seen += self.negative[index]
+            if seen > rank:
+                return -self._value(index)
+
+        seen += self.zero_count
+        if seen > rank:
+            return 0.0
+
+        for index in sorted(self.positive):
+            seen += self.positive[index]
+            if seen > rank:
+                return self._value(index)
+
+        return self._value(max(self.positive))
+
+    def _index(self, value: float) -> int:
+        return math.ceil(math.log(value) / self._log_gamma)
+
+    def _value(self, index: int) -> float:
+        return 2 * self._gamma ** index / (self._gamma + 1)
+
+    def to_dict(self) -> Dict[str, Any]:
+        # JSON object keys are strings, so buckets are stored as pairs.
+        return {
+            'relative_accuracy': self.relative_accuracy,
+            'count': self.count,
+            'zero_count': self.zero_count,
+            'positive': sorted(self.positive.items()),
+            'negative': sorted(self.negative.items()),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'QuantileSketch':
+        sketch = cls(data['relative_accuracy'])
+        sketch.count = data['count']
+        sketch.zero_count = data['zero_count']
+        sketch.positive = {index: count for index, count in data['positive']}
+        sketch.negative = {index: count for index, count in data['negative']}
+        return sketch
+
+
+class ScoreAggregate:
+    """All of the streaming aggregators tracked for a simulation run."""
+
+    def __init__(
+        self,
+        stats: Optional[RunningStats] = None,
+        histogram: Optional[Histogram] = None,
+        sketch: Optional[QuantileSketch] = None,
+    ) -> None:
+        self.stats = stats if stats is not None else RunningStats()
+        self.histogram = histogram if histogram is not None else Histogram(0, 10_000, 250)
+        self.sketch = sketch if sketch is not None else QuantileSketch()
+
+    def add(self, value: float) -> None:
+        self.stats.add(value)
+        self.histogram.add(value)
+        self.sketch.add(value)
+
+    def merge(self, other: 'ScoreAggregate') -> None:
+        self.stats.merge(other.stats)
+        self.histogram.merge(other.histogram)
+        self.sketch.merge(other.sketch)
+
+    def summary(self) -> str:
+        quantiles = ' '.join(
+            f'p{int(q * 100)}={self.sketch.quantile(q):.0f}' for q in (0.1, 0.5, 0.9) if self.stats.count
+        )
+        return f'n={self.stats.count} mean={self.stats.mean:.2f} sd={self.stats.stddev:.2f} {quantiles}'.rstrip()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'stats': self.stats.to_dict(),
+            'histogram': self.histogram.to_dict(),
+            'sketch': self.sketch.to_dict(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ScoreAggregate':
+        return cls(
+            stats=RunningStats.from_dict(data['stats']),
+            histogram=Histogram.from_dict(data['histogram']),
+            sketch=QuantileSketch.from_dict(data['sketch']),
+        )
+
+
+def derive_seed(master_seed: int, index: int) -> int:
+    """A seed for the index-th game of a run that does not depend on which games ran before it."""
+    digest = hashlib.sha256(f'{master_seed}:{index}'.encode()).digest()
+    return int.from_bytes(digest[:8], 'big')
+
+
+def play_seeded_game(master_seed: int, index: int, players: List[game.Player], score_to_win: int) -> game.PlayOutcome:
+    """Plays the index-th game of a run headlessly.
+
+    The game is seeded with derive_seed(master_seed, index) and the seating
+    order is rotated by one each game, so every game can be replayed on its own.
+    """
+    random.seed(derive_seed(master_seed, index))
+    seat = index % len(players)
+    game_engine = game.GameEngine(
+        players=players[seat:] + players[:seat],
+        board=game.Board([1,1,1,1,1,1]),
+        score_to_win=score_to_win,
+        verbose=False,
+    )
+
+    return game_engine.play()
+
+
+def winner_score(outcome: game.PlayOutcome) -> float:
+    return outcome.winner.score
+
+
+class SimulationRunner:
+    """Plays many games headlessly, streaming each result into a ScoreAggregate.
+
+    The aggregate and the state of the global `random` module are written to
+    `checkpoint_path` every `checkpoint_interval` seconds and when the run is
+    interrupted. Running again with the same checkpoint path picks up at the
+    next unplayed game with the same RNG state, so a resumed run produces the
+    same result as one that was never interrupted. The checkpoint is deleted
+    once all `num_games` games have been played.
+    """
+
+    CHECKPOINT_VERSION = 1
+
+    def __init__(
+        self,
+        game_engine: game.GameEngine,
+        num_games: int,
+        seed: int,
+        checkpoint_path: Optional[str] = None,
+        checkpoint_interval: float = 60.0,
+        progress_interval: Optional[float] = 10.0,
+        score_outcome: Callable[[game.PlayOutcome], float] = winner_score,
+        make_aggregate: Callable[[], ScoreAggregate] = ScoreAggregate,
+    ) -> None:
+        self._game_engine = game_engine
+        self._num_games = num_games
+        self._seed = seed
+        self._checkpoint_path = checkpoint_path
+        self._checkpoint_interval = checkpoint_interval
+        self._progress_interval = progress_interval
+        self._score_outcome = score_outcome
+        self._make_aggregate = make_aggregate
+
+        self.aggregate = make_aggregate()
+        self.games_played = 0
+        self._rng_state: Any = None
+
+    def run(self) -> ScoreAggregate:
+        if not self._load_checkpoint():
+            random.seed(self._seed)
+            self.aggregate = self._make_aggregate()
+            self.games_played = 0
+        self._rng_state = random.getstate()
+
+        start_time = time.monotonic()
+        start_games = self.games_played
+        last_checkpoint = last_progress = start_time
+
+        try:
+            while self.games_played < self._num_games:
+                outcome = self._game_engine.play()
+                score = self._score_outcome(outcome)
+                rng_state = random.getstate()
+
+                # Commit the game only once everything it needs is in hand, so an
+                # interrupt above leaves the count, aggregate and RNG state in step.
+                self.aggregate.add(score)
+                self.games_played += 1
+                self._rng_state = rng_state
+
+                now = time.monotonic()
+                if self._checkpoint_path and now - last_checkpoint >= self._checkpoint_interval:
+                    self._save_checkpoint()
+                    last_checkpoint = now
+                if self._progress_interval is not None and now - last_progress >= self._progress_interval:
+                    self._print_progress((self.games_played - start_games) / (now - start_time))
+                    last_progress = now
+        except BaseException:
+            # Includes KeyboardInterrupt. The saved RNG state is the one from the
+            # end of the last completed game, not the partially played one.
+            if self._checkpoint_path:
+                self._save_checkpoint()
+            raise
+
+        # The run is finished, so running again should start a fresh run.
+        if self._checkpoint_path and os.path.exists(self._checkpoint_path):
+            os.remove(self._checkpoint_path)
+
+        return self.aggregate
+
+    def _print_progress(self, games_per_second: float) -> None:
+        print(f'[{self.games_played}/{self._num_games}] {games_per_second:.1f} games/s {self.aggregate.summary()}')
+
+    def _save_checkpoint(self) -> None:
+        version, internal_state, gauss_next = self._rng_state
+        checkpoint = {
+            'version': self.CHECKPOINT_VERSION,
+            'seed': self._seed,
+            'num_games': self._num_games,
+            'games_played': self.games_played,
+            'aggregate': self.aggregate.to_dict(),
+            'rng_state': [version, list(internal_state), gauss_next],
+        }
+
+        # Write then rename so a crash mid-write never leaves a corrupt checkpoint.
+        tmp_path = f'{self._checkpoint_path}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(checkpoint, f)
+        os.replace(tmp_path, self._checkpoint_path)
+
+    def _load_checkpoint(self) -> bool:
+        if not self._checkpoint_path or not os.path.exists(self._checkpoint_path):
+            return False
+
+        with open(self._checkpoint_path) as f:
+            checkpoint = json.load(f)
+
+        if checkpoint['version'] != self.CHECKPOINT_VERSION:
+            raise ValueError(f'Unsupported checkpoint version: {checkpoint["version"]}')
+        if checkpoint['seed'] != self._seed:
+            raise ValueError(f'Checkpoint was made with seed {checkpoint["seed"]}, not {self._seed}')
+        if checkpoint['games_played'] > self._num_games:
+            raise ValueError(
+                f'Checkpoint has already played {checkpoint["games_played"]} of {checkpoint["num_games"]} games, '
+                f'more than the {self._num_games} requested'
+            )
+
+        version, internal_state, gauss_next = checkpoint['rng_state']
+        random.setstate((version, tuple(internal_state), gauss_next))
+        self.aggregate = ScoreAggregate.from_dict(checkpoint['aggregate'])
+        self.games_played = checkpoint['games_played']
+
+        return True
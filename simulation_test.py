@@ -0,0 +1,196 @@
+import os
+import random
+import statistics
+import tempfile
+import unittest
+
+import game
+import simulation
+
+
+def choose_first_keep_set(turn_state: game.TurnState, game_state: game.GameState) -> game.Action:
+    keep_sets = game.Board(turn_state.available_dice).get_available_keep_sets()
+    if keep_sets:
+        return game.Actions.keep_dice(keep_sets[0])
+    return game.Actions.reroll()
+
+
+def make_game_engine(choose_action=choose_first_keep_set) -> game.GameEngine:
+    return game.GameEngine(
+        players=[game.Player('bot', 0, choose_action)],
+        board=game.Board([1,1,1,1,1,1]),
+        score_to_win=0,
+        verbose=False,
+    )
+
+
+class RunningStatsTest(unittest.TestCase):
+    def test_add(self):
+        values = [3, 1, 4, 1, 5, 9, 2, 6]
+        stats = simulation.RunningStats()
+        for value in values:
+            stats.add(value)
+
+        self.assertEqual(stats.count, len(values))
+        self.assertAlmostEqual(stats.mean, statistics.mean(values))
+        self.assertAlmostEqual(stats.variance, statistics.variance(values))
+        self.assertEqual(stats.min, 1)
+        self.assertEqual(stats.max, 9)
+
+    def test_merge(self):
+        values = [3, 1, 4, 1, 5, 9, 2, 6]
+        left, right = simulation.RunningStats(), simulation.RunningStats()
+        for value in values[:3]:
+            left.add(value)
+        for value in values[3:]:
+            right.add(value)
+        left.merge(right)
+
+        self.assertEqual(left.count, len(values))
+        self.assertAlmostEqual(left.mean, statistics.mean(values))
+        self.assertAlmostEqual(left.variance, statistics.variance(values))
+
+
+class HistogramTest(unittest.TestCase):
+    def test_add(self):
+        histogram = simulation.Histogram(0, 100, 50)
+        for value in [-1, 0, 49, 50, 100]:
+            histogram.add(value)
+
+        self.assertEqual(histogram.bins, [2, 1])
+        self.assertEqual(histogram.underflow, 1)
+        self.assertEqual(histogram.overflow, 1)
+
+    def test_merge_different_bins(self):
+        with self.assertRaises(ValueError):
+            simulation.Histogram(0, 100, 50).merge(simulation.Histogram(0, 100, 25))
+
+
+class QuantileSketchTest(unittest.TestCase):
+    def test_quantile(self):
+        sketch = simulation.QuantileSketch(relative_accuracy=0.01)
+        values = list(range(1, 1001))
+        for value in values:
+            sketch.add(value)
+
+        for q in (0.1, 0.5, 0.99):
+            expected = values[int(q * (len(values) - 1))]
+            self.assertAlmostEqual(sketch.quantile(q), expected, delta=expected * 0.01)
+
+    def test_zero_and_negative(self):
+        sketch = simulation.QuantileSketch()
+        for value in [-100, 0, 0, 100]:
+            sketch.add(value)
+
+        self.assertAlmostEqual(sketch.quantile(0), -100, delta=1)
+        self.assertEqual(sketch.quantile(0.5), 0)
+        self.assertAlmostEqual(sketch.quantile(1), 100, delta=1)
+
+    def test_round_trip(self):
+        sketch = simulation.QuantileSketch()
+        for value in [0, 50, 300, 1000]:
+            sketch.add(value)
+
+        restored = simulation.QuantileSketch.from_dict(sketch.to_dict())
+        self.assertEqual(restored.quantile(0.5), sketch.quantile(0.5))
+
+
+def interrupt_after(num_games):
+    """A score_outcome that interrupts the run after num_games games have been counted."""
+    games = 0
+    def score_outcome(outcome):
+        nonlocal games
+        if games == num_games:
+            raise KeyboardInterrupt()
+        games += 1
+        return simulation.winner_score(outcome)
+    return score_outcome
+
+
+class SimulationRunnerTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self._checkpoint_path = os.path.join(self._tmp_dir.name, 'checkpoint.json')
+
+    def tearDown(self):
+        self._tmp_dir.cleanup()
+
+    def _interrupted_run(self, num_games, interrupt_after_games, seed=1):
+        runner = simulation.SimulationRunner(
+            make_game_engine(), num_games=num_games, seed=seed, checkpoint_path=self._checkpoint_path,
+            checkpoint_interval=3600, progress_interval=None, score_outcome=interrupt_after(interrupt_after_games))
+        with self.assertRaises(KeyboardInterrupt):
+            runner.run()
+        self.assertEqual(runner.games_played, interrupt_after_games)
+
+    def test_resume_matches_uninterrupted_run(self):
+        expected = simulation.SimulationRunner(
+            make_game_engine(), num_games=50, seed=1, progress_interval=None).run()
+
+        self._interrupted_run(num_games=50, interrupt_after_games=20)
+        resumed_runner = simulation.SimulationRunner(
+            make_game_engine(), num_games=50, seed=1, checkpoint_path=self._checkpoint_path,
+            progress_interval=None)
+        actual = resumed_runner.run()
+
+        self.assertEqual(resumed_runner.games_played, 50)
+        self.assertEqual(actual.to_dict(), expected.to_dict())
+        self.assertFalse(os.path.exists(self._checkpoint_path))
+
+    def test_finished_run_starts_fresh(self):
+        first = simulation.SimulationRunner(
+            make_game_engine(), num_games=20, seed=1, checkpoint_path=self._checkpoint_path,
+            progress_interval=None).run()
+        second_runner = simulation.SimulationRunner(
+            make_game_engine(), num_games=10, seed=1, checkpoint_path=self._checkpoint_path,
+            progress_interval=None)
+        second = second_runner.run()
+
+        self.assertEqual(first.stats.count, 20)
+        self.assertEqual(second_runner.games_played, 10)
+        self.assertEqual(second.stats.count, 10)
+
+    def test_resume_with_fewer_games(self):
+        self._interrupted_run(num_games=50, interrupt_after_games=20)
+
+        with self.assertRaises(ValueError):
+            simulation.SimulationRunner(
+                make_game_engine(), num_games=10, seed=1, checkpoint_path=self._checkpoint_path,
+                progress_interval=None).run()
+
+    def test_resume_after_interrupt(self):
+        expected = simulation.SimulationRunner(
+            make_game_engine(), num_games=30, seed=2, progress_interval=None).run()
+
+        calls = 0
+        def interrupt_eventually(turn_state, game_state):
+            nonlocal calls
+            calls += 1
+            if calls == 40:
+                raise KeyboardInterrupt()
+            return choose_first_keep_set(turn_state, game_state)
+
+        interrupted_runner = simulation.SimulationRunner(
+            make_game_engine(interrupt_eventually), num_games=30, seed=2,
+            checkpoint_path=self._checkpoint_path, checkpoint_interval=3600, progress_interval=None)
+        with self.assertRaises(KeyboardInterrupt):
+            interrupted_runner.run()
+        self.assertLess(interrupted_runner.games_played, 30)
+
+        random.seed(12345)
+        actual = simulation.SimulationRunner(
+            make_game_engine(), num_games=30, seed=2, checkpoint_path=self._checkpoint_path,
+            progress_interval=None).run()
+
+        self.assertEqual(actual.to_dict(), expected.to_dict())
+
+    def test_resume_with_different_seed(self):
+        self._interrupted_run(num_games=10, interrupt_after_games=1)
+
+        with self.assertRaises(ValueError):
+            simulation.SimulationRunner(
+                make_game_engine(), num_games=10, seed=2, checkpoint_path=self._checkpoint_path,
+                progress_interval=None).run()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,163 @@
+from concurrent.futures import ProcessPoolExecutor
+import dataclasses
+import math
+import random
+import statistics
+from typing import List, Optional, Tuple
+
+import bot_lib
+import game
+import simulation
+
+
+@dataclasses.dataclass(frozen=True)
+class CandidateResult:
+    strategy: bot_lib.Strategy
+    win_rate: float
+    confidence_interval: Tuple[float, float]
+    games: int
+
+
+def evaluate_strategy(
+    strategy: bot_lib.Strategy,
+    opponent: bot_lib.Strategy,
+    seed: int,
+    first_game: int,
+    num_games: int,
+    score_to_win: int,
+) -> simulation.RunningStats:
+    """Plays head-to-head games and records 1 for each win by `strategy` and 0 for each loss.
+
+    Game i is seeded from (seed, i) and the players swap seats every game, so
+    every candidate evaluated with the same seed starts game i from the same
+    RNG state (common random numbers). The dice diverge once strategies choose
+    differently.
+    """
+    stats = simulation.RunningStats()
+
+    for index in range(first_game, first_game + num_games):
+        candidate = game.Player('candidate', 0, strategy.choose_action)
+        baseline = game.Player('opponent', 0, opponent.choose_action)
+
+        outcome = simulation.play_seeded_game(seed, index, [candidate, baseline], score_to_win)
+        stats.add(1.0 if outcome.winner is candidate else 0.0)
+
+    return stats
+
+
+def _evaluate_chunk(args: Tuple[bot_lib.Strategy, bot_lib.Strategy, int, int, int, int]) -> simulation.RunningStats:
+    return evaluate_strategy(*args)
+
+
+def _confidence_interval(stats: simulation.RunningStats, confidence: float) -> Tuple[float, float]:
+    """Wilson score interval for a win rate. Unlike the normal approximation it
+    stays wide for 0/n and n/n results, which are common after short rounds."""
+    if stats.count == 0:
+        return 0.0, 1.0
+
+    z = statistics.NormalDist().inv_cdf((1 + confidence) / 2)
+    n = stats.count
+    p = stats.mean
+    denominator = 1 + z * z / n
+    center = (p + z * z / (2 * n)) / denominator
+    half_width = z / denominator * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n))
+    return max(0.0, center - half_width), min(1.0, center + half_width)
+
+
+def successive_halving(
+    candidates: List[bot_lib.Strategy],
+    opponent: bot_lib.Strategy = bot_lib.Strategy(),
+    seed: int = 0,
+    initial_games: int = 100,
+    eta: int = 2,
+    score_to_win: int = 5000,
+    workers: Optional[int] = None,
+    chunk_size: int = 50,
+    confidence: float = 0.95,
+    verbose: bool = True,
+) -> List[CandidateResult]:
+    """Finds the candidates with the best win rate against `opponent`.
+
+    Each round plays every remaining candidate on the same fresh block of
+    games, keeps the best 1/eta of them and multiplies the games per round by
+    eta, until one candidate is left. Games are spread across `workers`
+    processes. Results are returned best first; candidates that survived more
+    rounds rank above those dropped earlier.
+    """
+    if not candidates:
+        raise ValueError('No candidates to search')
+    if eta < 2:
+        raise ValueError(f'eta must be at least 2: {eta}')
+
+    all_stats = [simulation.RunningStats() for _ in candidates]
+    remaining = list(range(len(candidates)))
+    games_per_round = initial_games
+    first_game = 0
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        while True:
+            if verbose:
+                print(f'Evaluating {len(remaining)} candidates on {games_per_round} games each')
+
+            tasks = []
+            for candidate_index in remaining:
+                for chunk_start in range(first_game, first_game + games_per_round, chunk_size):
+                    chunk_games = min(chunk_size, first_game + games_per_round - chunk_start)
+                    tasks.append((candidate_index, (
+                        candidates[candidate_index], opponent, seed, chunk_start, chunk_games, score_to_win,
+                    )))
+
+            # map() yields in submission order, so merging is deterministic.
+            chunk_results = executor.map(_evaluate_chunk, [args for _, args in tasks])
+            for (candidate_index, _), chunk_stats in zip(tasks, chunk_results):
+                all_stats[candidate_index].merge(chunk_stats)
+
+            first_game += games_per_round
+            if len(remaining) == 1:
+                break
+
+            remaining.sort(key=lambda candidate_index: all_stats[candidate_index].mean, reverse=True)
+            remaining = remaining[:math.ceil(len(remaining) / eta)]
+            games_per_round *= eta
+
+    results = [
+        CandidateResult(
+            strategy=candidates[candidate_index],
+            win_rate=stats.mean,
+            confidence_interval=_confidence_interval(stats, confidence),
+            games=stats.count,
+        )
+        for candidate_index, stats in enumerate(all_stats)
+    ]
+    results.sort(key=lambda result: (result.games, result.win_rate), reverse=True)
+
+    return results
+
+
+def random_strategies(count: int, seed: int) -> List[bot_lib.Strategy]:
+    rng = random.Random(seed)
+    strategies = []
+
+    for _ in range(count):
+        bank_thresholds = sorted(rng.randrange(200, 1050, 50) for _ in range(game.Board.MAX_DICE))
+        strategies.append(bot_lib.Strategy(
+            bank_thresholds=tuple(bank_thresholds),
+            extra_keep_min_score=rng.choice([50, 100, 200, 300, 1000]),
+            chase_margin=rng.choice([0, 50, 100, 250, 500]),
+            hail_mary_deficit=rng.choice([None, 1000, 1500, 2000, 3000]),
+        ))
+
+    return strategies
+
+
+def main():
+    seed = 642281
+    results = successive_halving(random_strategies(32, seed), seed=seed)
+
+    for result in results[:5]:
+        low, high = result.confidence_interval
+        print(f'{result.win_rate:.3f} [{low:.3f}, {high:.3f}] over {result.games} games: {result.strategy}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+import unittest
+
+import bot_lib
+import simulation
+import strategy_search
+
+
+class SuccessiveHalvingTest(unittest.TestCase):
+    def test_evaluate_strategy_is_deterministic(self):
+        strategy = bot_lib.Strategy(bank_thresholds=(200, 200, 200, 200, 200, 200))
+        first = strategy_search.evaluate_strategy(strategy, bot_lib.Strategy(), 1, 0, 10, 1000)
+        second = strategy_search.evaluate_strategy(strategy, bot_lib.Strategy(), 1, 0, 10, 1000)
+
+        self.assertEqual(first.count, 10)
+        self.assertEqual(first.to_dict(), second.to_dict())
+
+    def test_successive_halving(self):
+        candidates = strategy_search.random_strategies(4, seed=1)
+        results = strategy_search.successive_halving(
+            candidates, seed=1, initial_games=8, score_to_win=1000, workers=2, chunk_size=4, verbose=False)
+
+        self.assertEqual(len(results), 4)
+        self.assertEqual([result.games for result in results], [56, 24, 8, 8])
+        for result in results:
+            low, high = result.confidence_interval
+            self.assertLessEqual(low, result.win_rate)
+            self.assertLessEqual(result.win_rate, high)
+
+    def test_successive_halving_is_deterministic(self):
+        candidates = strategy_search.random_strategies(3, seed=2)
+        kwargs = dict(seed=2, initial_games=6, score_to_win=1000, chunk_size=4, verbose=False)
+
+        self.assertEqual(
+            strategy_search.successive_halving(candidates, workers=1, **kwargs),
+            strategy_search.successive_halving(candidates, workers=3, **kwargs),
+        )
+
+    def test_confidence_interval_for_all_wins_or_losses(self):
+        for outcome in (0.0, 1.0):
+            stats = simulation.RunningStats()
+            for _ in range(8):
+                stats.add(outcome)
+
+            low, high = strategy_search._confidence_interval(stats, 0.95)
+            self.assertLessEqual(low, outcome)
+            self.assertLessEqual(outcome, high)
+            self.assertGreater(high - low, 0.2)
+
+    def test_confidence_interval(self):
+        stats = simulation.RunningStats()
+        for outcome in [1.0] * 60 + [0.0] * 40:
+            stats.add(outcome)
+
+        low, high = strategy_search._confidence_interval(stats, 0.95)
+        self.assertAlmostEqual(low, 0.502, places=3)
+        self.assertAlmostEqual(high, 0.691, places=3)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,27 +1,31 @@
-import random
+import functools
 
 import bot_lib
 import game
+import simulation
 
 
 def main():
     seed = 642281
-    random.seed(seed)
-    player = game.Player('trev-bot', 0, bot_lib.choose_action_with_bot)
+    player = game.Player('trev-bot', 0, functools.partial(bot_lib.choose_action_with_bot, verbose=False))
     board = game.Board([1,1,1,1,1,1])
     game_engine = game.GameEngine(
         players=[player],
         board=board,
         score_to_win=0,
+        verbose=False,
     )
 
-    points = []
-    for _ in range(10_000):
-        outcome = game_engine.play()
-        points.append(outcome.winner.score)
-
-    print(sum(points) / len(points))
+    runner = simulation.SimulationRunner(
+        game_engine=game_engine,
+        num_games=10_000,
+        seed=seed,
+        checkpoint_path=f'test_bot_{seed}.checkpoint.json',
+    )
+    aggregate = runner.run()
 
+    print(aggregate.summary())
 
-main()
 
+if __name__ == '__main__':
+    main()